@@ -103,8 +103,9 @@ class EmuNAND:
         existing_hashes = []
         if content_map_path.exists():
             content_map.load(content_map_path.read_bytes())
+            # The content map stores its hashes as hex, while content records store them as raw bytes.
             for record in content_map.shared_records:
-                existing_hashes.append(record.content_hash)
+                existing_hashes.append(bytes.fromhex(record.content_hash.decode()))
         for content_file in range(0, title.tmd.num_contents):
             if title.tmd.content_records[content_file].content_type == 32769:
                 if title.tmd.content_records[content_file].content_hash not in existing_hashes:
@@ -44,8 +44,10 @@ def _pad_bytes(data, alignment=64) -> bytes:
     bytes
         The aligned data.
     """
-    while (len(data) % alignment) != 0:
-        data += b'\x00'
+    # Work out how much padding is needed up front, so that it can be added all at once instead of one byte at a time.
+    padding_size = _align_value(len(data), alignment) - len(data)
+    if padding_size:
+        data += b'\x00' * padding_size
     return data
 
 
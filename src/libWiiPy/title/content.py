@@ -7,10 +7,11 @@ import binascii
 import io
 import hashlib
 from typing import List
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 from dataclasses import dataclass as _dataclass
 from enum import IntEnum as _IntEnum
 from ..types import _ContentRecord
-from ..shared import _pad_bytes, _align_value
+from ..shared import _align_value
 from .crypto import decrypt_content, encrypt_content
 
 
@@ -55,28 +56,29 @@ class ContentRegion:
         self.content_records = content_records
         # Get the total size of the content region.
         self.content_region_size = len(content_region)
-        with io.BytesIO(content_region) as content_region_data:
-            self.num_contents = len(self.content_records)
-            # Calculate the offsets of each content in the content region.
-            # Content is aligned to 16 bytes, however a new content won't start until the next multiple of 64 bytes.
-            # Because of this, we need to add bytes to the next 64 byte offset if the previous content wasn't that long.
-            for content in self.content_records[:-1]:
-                start_offset = content.content_size + self.content_start_offsets[-1]
-                if (content.content_size % 64) != 0:
-                    start_offset += 64 - (content.content_size % 64)
-                self.content_start_offsets.append(start_offset)
-            # Build a list of all the encrypted content data.
-            for content in range(self.num_contents):
-                # Seek to the start of the content based on the list of offsets.
-                content_region_data.seek(self.content_start_offsets[content])
-                # Calculate the number of bytes we need to read by adding bytes up the nearest multiple of 16 if needed.
-                bytes_to_read = self.content_records[content].content_size
-                if (bytes_to_read % 16) != 0:
-                    bytes_to_read += 16 - (bytes_to_read % 16)
-                # Read the file based on the size of the content in the associated record, then append that data to
-                # the list of content.
-                content_enc = content_region_data.read(bytes_to_read)
-                self.content_list.append(content_enc)
+        # Slice the content out of a memoryview of the region, so that only the content itself is copied.
+        content_region_data = memoryview(content_region)
+        self.num_contents = len(self.content_records)
+        # Calculate the offsets of each content in the content region.
+        # Content is aligned to 16 bytes, however a new content won't start until the next multiple of 64 bytes.
+        # Because of this, we need to add bytes to the next 64 byte offset if the previous content wasn't that long.
+        for content in self.content_records[:-1]:
+            start_offset = content.content_size + self.content_start_offsets[-1]
+            if (content.content_size % 64) != 0:
+                start_offset += 64 - (content.content_size % 64)
+            self.content_start_offsets.append(start_offset)
+        # Build a list of all the encrypted content data.
+        for content in range(self.num_contents):
+            # Get the start of the content based on the list of offsets.
+            start_offset = self.content_start_offsets[content]
+            # Calculate the number of bytes we need to read by adding bytes up the nearest multiple of 16 if needed.
+            bytes_to_read = self.content_records[content].content_size
+            if (bytes_to_read % 16) != 0:
+                bytes_to_read += 16 - (bytes_to_read % 16)
+            # Read the file based on the size of the content in the associated record, then append that data to
+            # the list of content.
+            content_enc = bytes(content_region_data[start_offset:start_offset + bytes_to_read])
+            self.content_list.append(content_enc)
 
     def dump(self) -> tuple[bytes, int]:
         """
@@ -91,19 +93,17 @@ class ContentRegion:
         int
             The size of the ContentRegion, including padding.
         """
-        content_region_data = b''
+        # Collect each content followed by its padding, and then join them all at once so that the region only needs to
+        # be allocated and copied into once. Every content is padded to 64 bytes so that the next one starts on a 64
+        # byte boundary, except for the last one, which only needs to be padded to 16 bytes.
+        content_sections = []
         for content in self.content_list:
-            # If this isn't the first content, pad the whole region to 64 bytes before the next one.
-            if content_region_data != b'':
-                content_region_data = _pad_bytes(content_region_data, 64)
-            # Calculate padding after this content before the next one.
-            padding_bytes = 0
-            if (len(content) % 16) != 0:
-                padding_bytes = 16 - (len(content) % 16)
-            # Write content data, then the padding afterward if necessary.
-            content_region_data += content
-            if padding_bytes > 0:
-                content_region_data += b'\x00' * padding_bytes
+            content_sections.append(content)
+            content_sections.append(b'\x00' * (_align_value(len(content), 64) - len(content)))
+        if content_sections:
+            last_content = self.content_list[-1]
+            content_sections[-1] = b'\x00' * (_align_value(len(last_content), 16) - len(last_content))
+        content_region_data = b''.join(content_sections)
         # Calculate the size of the whole content region.
         content_region_size = 0
         for record in range(len(self.content_records)):
@@ -190,8 +190,8 @@ class ContentRegion:
         content_dec = decrypt_content(content_enc, title_key, cnt_index, self.content_records[index].content_size)
         # Hash the decrypted content and ensure that the hash matches the one in its Content Record.
         # If it does not, then something has gone wrong in the decryption, and an error will be thrown.
-        content_dec_hash = hashlib.sha1(content_dec).hexdigest()
-        content_record_hash = str(self.content_records[index].content_hash.decode())
+        content_dec_hash = hashlib.sha1(content_dec).digest()
+        content_record_hash = self.content_records[index].content_hash
         # Compare the hash and throw a ValueError if the hash doesn't match.
         if content_dec_hash != content_record_hash:
             if skip_hash:
@@ -199,8 +199,8 @@ class ContentRegion:
             else:
                 raise ValueError("Content hash did not match the expected hash in its record! The incorrect Title Key "
                                  "may have been used!\n"
-                                 "Expected hash is: {}\n".format(content_record_hash) +
-                                 "Actual hash is: {}".format(content_dec_hash))
+                                 "Expected hash is: {}\n".format(content_record_hash.hex()) +
+                                 "Actual hash is: {}".format(content_dec_hash.hex()))
         return content_dec
 
     def get_content_by_cid(self, cid: int, title_key: bytes, skip_hash=False) -> bytes:
@@ -245,10 +245,11 @@ class ContentRegion:
         List[bytes]
             A list containing all decrypted contents.
         """
-        dec_contents: List[bytes] = []
-        # Iterate over every content, get the decrypted version of it, then add it to a list and return it.
-        for content in range(self.num_contents):
-            dec_contents.append(self.get_content_by_index(content, title_key, skip_hash))
+        # Decrypt and verify every content in parallel. Both AES and SHA-1 release the GIL while working on large
+        # buffers, so threads are enough here. map() returns the results in index order.
+        with _ThreadPoolExecutor() as executor:
+            dec_contents: List[bytes] = list(executor.map(
+                lambda content: self.get_content_by_index(content, title_key, skip_hash), range(self.num_contents)))
         return dec_contents
 
     def get_index_from_cid(self, cid: int) -> int:
@@ -293,7 +294,7 @@ class ContentRegion:
         content_size : int
             The size of the new encrypted content when decrypted.
         content_hash : bytes
-            The hash of the new encrypted content when decrypted.
+            The raw SHA-1 hash of the new encrypted content when decrypted.
         """
         # Check to make sure this isn't reusing an already existing Content ID or index first.
         for record in self.content_records:
@@ -332,10 +333,50 @@ class ContentRegion:
             content_indices.append(record.index)
         index = max(content_indices) + 1
         content_size = len(dec_content)
-        content_hash = str.encode(hashlib.sha1(dec_content).hexdigest())
+        content_hash = hashlib.sha1(dec_content).digest()
         enc_content = encrypt_content(dec_content, title_key, index)
         self.add_enc_content(enc_content, cid, index, content_type, content_size, content_hash)
 
+    def add_contents(self, dec_contents: List[tuple[bytes, int, int]], title_key: bytes) -> None:
+        """
+        Adds multiple new decrypted contents to the end of the ContentRegion at once, and adds a new record to the
+        ContentRecord list for each of them. Each content is provided as a tuple of its data, Content ID, and content
+        type. Indices will be automatically assigned in order by incrementing the current highest index in the records.
+
+        The contents are hashed and encrypted with the provided Title Key in parallel before being added to the
+        ContentRegion, which is much faster than adding each content one at a time with add_content().
+
+        Parameters
+        ----------
+        dec_contents : List[tuple[bytes, int, int]]
+            The new decrypted contents to add, as tuples of (data, Content ID, content type).
+        title_key : bytes
+            The Title Key that matches the other content in the ContentRegion.
+        """
+        # Check that none of the new Content IDs are already in use before doing any work, so that the region isn't left
+        # with only some of the new contents added.
+        content_ids = [record.content_id for record in self.content_records]
+        for _, cid, _ in dec_contents:
+            if cid in content_ids:
+                raise ValueError("Content with a Content ID of " + str(cid) + " already exists!")
+            content_ids.append(cid)
+        # Find the current highest content index, and assign indices to the new contents counting up from there.
+        content_indices = [record.index for record in self.content_records]
+        first_index = max(content_indices) + 1
+        indices = range(first_index, first_index + len(dec_contents))
+
+        def hash_and_encrypt(dec_content: bytes, index: int) -> tuple[int, bytes, bytes]:
+            content_hash = hashlib.sha1(dec_content).digest()
+            return len(dec_content), content_hash, encrypt_content(dec_content, title_key, index)
+
+        # Both SHA-1 and AES release the GIL while working on large buffers, so threads are enough here. map() returns
+        # the results in the same order as the contents were provided.
+        with _ThreadPoolExecutor() as executor:
+            results = list(executor.map(hash_and_encrypt, [content[0] for content in dec_contents], indices))
+        for (_, cid, content_type), index, (content_size, content_hash, enc_content) in zip(dec_contents, indices,
+                                                                                            results):
+            self.add_enc_content(enc_content, cid, index, content_type, content_size, content_hash)
+
     def set_enc_content(self, enc_content: bytes, index: int, content_size: int, content_hash: bytes, cid: int = None,
                         content_type: int = None) -> None:
         """
@@ -352,7 +393,7 @@ class ContentRegion:
         content_size : int
             The size of the new encrypted content when decrypted.
         content_hash : bytes
-            The hash of the new encrypted content when decrypted.
+            The raw SHA-1 hash of the new encrypted content when decrypted.
         cid : int, optional
             The Content ID to assign the new content in the content record. Current value will be preserved if not set.
         content_type : int, optional
@@ -398,7 +439,7 @@ class ContentRegion:
         # Store the size of the new content.
         content_size = len(dec_content)
         # Calculate the hash of the new content.
-        content_hash = str.encode(hashlib.sha1(dec_content).hexdigest())
+        content_hash = hashlib.sha1(dec_content).digest()
         # Encrypt the content using the provided Title Key and the index from the Content Record, to ensure that
         # encryption will succeed even if the provided index doesn't match the content's index.
         enc_content = encrypt_content(dec_content, title_key, self.content_records[index].index)
@@ -445,11 +486,11 @@ class ContentRegion:
             raise ValueError(f"You are trying to load the content at index {index}, but no content with that "
                              f"index currently exists! Make sure the correct content records have been loaded.")
         # Check the hash of the content against the hash stored in the record to ensure it matches.
-        content_hash = hashlib.sha1(dec_content).hexdigest()
-        if content_hash != self.content_records[index].content_hash.decode():
+        content_hash = hashlib.sha1(dec_content).digest()
+        if content_hash != self.content_records[index].content_hash:
             raise ValueError("The decrypted content provided does not match the record at the provided index. \n"
-                             "Expected hash is: {}\n".format(self.content_records[index].content_hash.decode()) +
-                             "Actual hash is: {}".format(content_hash))
+                             "Expected hash is: {}\n".format(self.content_records[index].content_hash_hex) +
+                             "Actual hash is: {}".format(content_hash.hex()))
         # Add blank entries to the list to ensure that its length matches the length of the content record list.
         while len(self.content_list) < len(self.content_records):
             self.content_list.append(b'')
@@ -100,6 +100,47 @@ def encrypt_title_key(title_key_dec: bytes, common_key_index: int, title_id: byt
     return title_key
 
 
+def rewrap_title_key(title_key_enc: bytes, common_key_index: int, old_title_id: bytes | str,
+                     new_title_id: bytes | str, dev=False) -> bytes:
+    """
+    Re-encrypts the provided encrypted Title Key for a new Title ID, without changing the Title Key itself. This is
+    equivalent to decrypting the Title Key with the old Title ID and then encrypting it again with the new one, but only
+    needs to set up the common key once.
+
+    Parameters
+    ----------
+    title_key_enc : bytes
+        The encrypted Title Key.
+    common_key_index : int
+        The index of the common key used to encrypt the Title Key.
+    old_title_id : bytes, str
+        The Title ID that the Title Key is currently encrypted for.
+    new_title_id : bytes, str
+        The Title ID that the Title Key should be encrypted for.
+    dev : bool
+        Whether the Title Key is encrypted with the development key or not.
+
+    Returns
+    -------
+    bytes
+        The Title Key, encrypted for the new Title ID.
+    """
+    # Load the correct common key for the title.
+    common_key = get_common_key(common_key_index, dev)
+    # Convert both Title IDs into IVs. The last 8 bytes of the IV are always zero, so only the first 8 need to be used.
+    old_iv = _convert_tid_to_iv(old_title_id)
+    new_iv = _convert_tid_to_iv(new_title_id)
+    # The Title Key is a single AES block, so CBC mode is just an XOR with the IV on either side of one block operation.
+    # This means that a single ECB AES object can be used to both decrypt and encrypt the key, by swapping the old IV
+    # for the new one in between.
+    aes = _AES.new(common_key, _AES.MODE_ECB)
+    title_key_xored = bytearray(aes.decrypt(title_key_enc))
+    for byte in range(8):
+        title_key_xored[byte] ^= old_iv[byte] ^ new_iv[byte]
+    title_key = aes.encrypt(bytes(title_key_xored))
+    return title_key
+
+
 def decrypt_content(content_enc, title_key, content_index, content_length) -> bytes:
     """
     Gets the decrypted version of the encrypted content.
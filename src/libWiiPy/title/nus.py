@@ -258,16 +258,16 @@ def download_contents(title_id: str, tmd: TMD, wiiu_endpoint: bool = False,
     """
     # Retrieve the content records from the TMD.
     content_records = tmd.content_records
-    # Create a list of Content IDs to download.
-    content_ids = []
-    for content_record in content_records:
-        content_ids.append(content_record.content_id)
-    # Iterate over that list and download each content in it, then add it to the array of contents.
-    content_list = []
+    # Create a list of unique Content IDs to download, preserving the order they're listed in. Some TMDs list the same
+    # Content ID more than once, and there's no reason to download the same content twice.
+    content_ids = list(dict.fromkeys(content_record.content_id for content_record in content_records))
+    # Iterate over that list and download each content in it, keyed by its Content ID.
+    downloaded_contents = {}
     for content_id in content_ids:
         # Call self.download_content() for each Content ID.
-        content = download_content(title_id, content_id, wiiu_endpoint, endpoint_override)
-        content_list.append(content)
+        downloaded_contents[content_id] = download_content(title_id, content_id, wiiu_endpoint, endpoint_override)
+    # Build the array of contents in record order from the downloaded contents.
+    content_list = [downloaded_contents[content_record.content_id] for content_record in content_records]
     return content_list
 
 
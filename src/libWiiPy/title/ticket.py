@@ -3,16 +3,24 @@
 #
 # See https://wiibrew.org/wiki/Ticket for details about the ticket format
 
-import io
 import binascii
 import hashlib
+import struct
 from dataclasses import dataclass as _dataclass
 from .crypto import decrypt_title_key
 from typing import List
-from .util import title_ver_standard_to_dec
+from .util import title_ver_standard_to_dec, _validate_title_id
 
+# The layout of a v0 Ticket, which is always 676 bytes long. Fields are, in order: signature type, signature, signature
+# issuer, ECDH data, ticket version, Title Key, Ticket ID, Console ID, Title ID, unknown data 1, title version,
+# permitted titles mask, permit mask, title export allowed, common key index, unknown data 2, content access
+# permissions, and then the type and maximum usage of each of the 8 title limits.
+_ticket_struct = struct.Struct(">4s256s60x64s60sB2x16sx8sI8s2sH4s4sBB48s64s2x16I")
+# The all-NULL signature used by fakesigned Tickets.
+_null_signature = b'\x00' * 256
 
-@_dataclass
+
+@_dataclass(slots=True)
 class _TitleLimit:
     """
     A TitleLimit object that contains the type of restriction and the limit. The limit type can be one of the following:
@@ -57,6 +65,12 @@ class Ticket:
     common_key_index : int
         The index of the common key required to decrypt this ticket's Title Key.
     """
+    __slots__ = ("is_dev", "signature_type", "signature", "signature_issuer", "ecdh_data", "ticket_version",
+                 "title_key_enc", "ticket_id", "console_id", "title_id", "unknown1", "title_version",
+                 "permitted_titles", "permit_mask", "title_export_allowed", "common_key_index", "unknown2",
+                 "content_access_permissions", "title_limits_list", "_title_key_cache", "_title_key_cache_tag",
+                 "_title_id_str", "_title_id_str_tag")
+
     def __init__(self):
         # If this is a dev ticket
         self.is_dev: bool = False  # Defaults to false, set to true during load if this ticket is using dev certs.
@@ -82,6 +96,13 @@ class Ticket:
         self.unknown2: bytes = b''  # More unknown data. Varies for VC/non-VC titles so reading it to ensure it matches.
         self.content_access_permissions: bytes = b''  # "Content access permissions (one bit for each content)"
         self.title_limits_list: List[_TitleLimit] = []  # List of play limits applied to the title.
+        # The decrypted Title Key, and the values it was decrypted from. Used to skip decrypting it again when nothing
+        # that it depends on has changed.
+        self._title_key_cache: bytes = b''
+        self._title_key_cache_tag: tuple = ()
+        # The Title ID decoded into a string, and the Title ID it was decoded from.
+        self._title_id_str: str = ""
+        self._title_id_str_tag: bytes | None = None
         # v1 ticket data
         # TODO: Write in v1 ticket attributes here. This code can currently only handle v0 tickets, and will reject v1.
 
@@ -95,75 +116,22 @@ class Ticket:
         ticket : bytes
             The data for the Ticket you wish to load.
         """
-        with io.BytesIO(ticket) as ticket_data:
-            # ====================================================================================
-            # Parses each of the keys contained in the Ticket.
-            # ====================================================================================
-            # Signature type.
-            ticket_data.seek(0x0)
-            self.signature_type = ticket_data.read(4)
-            # Signature data.
-            ticket_data.seek(0x04)
-            self.signature = ticket_data.read(256)
-            # Signature issuer.
-            ticket_data.seek(0x140)
-            self.signature_issuer = str(ticket_data.read(64).replace(b'\x00', b'').decode())
-            # ECDH data.
-            ticket_data.seek(0x180)
-            self.ecdh_data = ticket_data.read(60)
-            # Ticket version.
-            ticket_data.seek(0x1BC)
-            self.ticket_version = int.from_bytes(ticket_data.read(1))
-            if self.ticket_version == 1:
-                raise ValueError("This appears to be a v1 ticket, which is not currently supported by libWiiPy. This "
-                                 "feature is planned for a later release. Only v0 tickets are supported at this time.")
-            # Title Key (Encrypted by a common key).
-            ticket_data.seek(0x1BF)
-            self.title_key_enc = ticket_data.read(16)
-            # Ticket ID.
-            ticket_data.seek(0x1D0)
-            self.ticket_id = ticket_data.read(8)
-            # Console ID.
-            ticket_data.seek(0x1D8)
-            self.console_id = int.from_bytes(ticket_data.read(4))
-            # Title ID.
-            ticket_data.seek(0x1DC)
-            self.title_id = binascii.hexlify(ticket_data.read(8))
-            # Unknown data 1.
-            ticket_data.seek(0x1E4)
-            self.unknown1 = ticket_data.read(2)
-            # Title version.
-            ticket_data.seek(0x1E6)
-            self.title_version = int.from_bytes(ticket_data.read(2))
-            # Permitted titles mask.
-            ticket_data.seek(0x1E8)
-            self.permitted_titles = ticket_data.read(4)
-            # Permit mask.
-            ticket_data.seek(0x1EC)
-            self.permit_mask = ticket_data.read(4)
-            # Whether title export with a PRNG key is allowed.
-            ticket_data.seek(0x1F0)
-            self.title_export_allowed = int.from_bytes(ticket_data.read(1))
-            # Common key index.
-            ticket_data.seek(0x1F1)
-            self.common_key_index = int.from_bytes(ticket_data.read(1))
-            # Unknown data 2.
-            ticket_data.seek(0x1F2)
-            self.unknown2 = ticket_data.read(48)
-            # Content access permissions.
-            ticket_data.seek(0x222)
-            self.content_access_permissions = ticket_data.read(64)
-            # Content limits.
-            ticket_data.seek(0x264)
-            for limit in range(0, 8):
-                limit_type = int.from_bytes(ticket_data.read(4))
-                limit_value = int.from_bytes(ticket_data.read(4))
-                self.title_limits_list.append(_TitleLimit(limit_type, limit_value))
+        # Parse every field of the Ticket at once, since they're all at fixed offsets.
+        (self.signature_type, self.signature, signature_issuer, self.ecdh_data, self.ticket_version,
+         self.title_key_enc, self.ticket_id, self.console_id, title_id, self.unknown1, self.title_version,
+         self.permitted_titles, self.permit_mask, self.title_export_allowed, self.common_key_index, self.unknown2,
+         self.content_access_permissions, *title_limits) = _ticket_struct.unpack_from(ticket)
+        if self.ticket_version == 1:
+            raise ValueError("This appears to be a v1 ticket, which is not currently supported by libWiiPy. This "
+                             "feature is planned for a later release. Only v0 tickets are supported at this time.")
+        # The issuer is NULL-padded, so only the part before the first NULL byte is needed.
+        self.signature_issuer = signature_issuer.split(b'\x00', 1)[0].decode('ascii')
+        self.title_id = binascii.hexlify(title_id)
+        # Content limits, stored as pairs of the limit type and the maximum usage.
+        self.title_limits_list = [_TitleLimit(title_limits[limit], title_limits[limit + 1])
+                                  for limit in range(0, len(title_limits), 2)]
         # Check certs to see if this is a retail or dev ticket. Treats unknown certs as being retail for now.
-        if self.signature_issuer.find("Root-CA00000002-XS00000006") != -1:
-            self.is_dev = True
-        else:
-            self.is_dev = False
+        self.is_dev = self.signature_issuer.startswith("Root-CA00000002-XS00000006")
 
     def dump(self) -> bytes:
         """
@@ -174,60 +142,20 @@ class Ticket:
         bytes
             The full Ticket file as bytes.
         """
-        ticket_data = b''
-        # Signature type.
-        ticket_data += self.signature_type
-        # Signature data.
-        ticket_data += self.signature
-        # Padding to 64 bytes.
-        ticket_data += b'\x00' * 60
-        # Signature issuer.
-        signature_issuer = self.signature_issuer.encode()
-        while len(signature_issuer) < 0x40:
-            signature_issuer += b'\x00'
-        ticket_data += signature_issuer
-        # ECDH data.
-        ticket_data += self.ecdh_data
-        # Ticket version.
-        ticket_data += int.to_bytes(self.ticket_version, 1)
-        # Reserved (all \0x00).
-        ticket_data += b'\x00\x00'
-        # Title Key.
-        ticket_data += self.title_key_enc
-        # Unknown (write \0x00).
-        ticket_data += b'\x00'
-        # Ticket ID.
-        ticket_data += self.ticket_id
-        # Console ID.
-        ticket_data += int.to_bytes(self.console_id, 4)
-        # Title ID.
-        ticket_data += binascii.unhexlify(self.title_id)
-        # Unknown data 1.
-        ticket_data += self.unknown1
-        # Title version.
-        ticket_data += int.to_bytes(self.title_version, 2)
-        # Permitted titles mask.
-        ticket_data += self.permitted_titles
-        # Permit mask.
-        ticket_data += self.permit_mask
-        # Title Export allowed.
-        ticket_data += int.to_bytes(self.title_export_allowed, 1)
-        # Common Key index.
-        ticket_data += int.to_bytes(self.common_key_index, 1)
-        # Unknown data 2.
-        ticket_data += self.unknown2
-        # Content access permissions.
-        ticket_data += self.content_access_permissions
-        # Padding (always \x00).
-        ticket_data += b'\x00\x00'
-        # Iterate over Title Limit objects, write them back into raw data, then add them to the Ticket.
-        for title_limit in range(len(self.title_limits_list)):
-            title_limit_data = b''
-            # Write all fields from the title limit entry.
-            title_limit_data += int.to_bytes(self.title_limits_list[title_limit].limit_type, 4)
-            title_limit_data += int.to_bytes(self.title_limits_list[title_limit].maximum_usage, 4)
-            # Write the entry to the ticket.
-            ticket_data += title_limit_data
+        # Flatten the title limits back into pairs of the limit type and the maximum usage. A v0 Ticket always has
+        # room for 8 limits, so any that aren't set are written as empty.
+        title_limits = []
+        for title_limit in self.title_limits_list:
+            title_limits += [title_limit.limit_type, title_limit.maximum_usage]
+        title_limits += [0] * (16 - len(title_limits))
+        # Pack every field of the Ticket at once. Padding is added automatically, including padding the signature
+        # issuer out to 64 bytes.
+        ticket_data = _ticket_struct.pack(self.signature_type, self.signature, self.signature_issuer.encode(),
+                                          self.ecdh_data, self.ticket_version, self.title_key_enc, self.ticket_id,
+                                          self.console_id, binascii.unhexlify(self.title_id), self.unknown1,
+                                          self.title_version, self.permitted_titles, self.permit_mask,
+                                          self.title_export_allowed, self.common_key_index, self.unknown2,
+                                          self.content_access_permissions, *title_limits)
         return ticket_data
 
     def fakesign(self) -> None:
@@ -246,23 +174,24 @@ class Ticket:
         """
         # Clear the signature, so that the hash derived from it is guaranteed to always be
         # '0000000000000000000000000000000000000000'.
-        self.signature = b'\x00' * 256
-        current_int = 0
-        test_hash = ''
-        while test_hash[:2] != '00':
-            current_int += 1
-            # We're using the first 2 bytes of this unused region of the Ticket as a 16-bit integer, and incrementing
-            # that to brute-force the hash we need.
-            data_to_edit = self.unknown2
-            data_to_edit = int.to_bytes(current_int, 2) + data_to_edit[2:]
-            self.unknown2 = data_to_edit
-            # Trim off the first 320 bytes, because we're only looking for the hash of the Ticket's body.
-            # This is a try-except because an OverflowError will be thrown if the number being used to brute-force the
-            # hash gets too big, as it is only a 16-bit integer. If that happens, then fakesigning has failed.
-            try:
-                test_hash = hashlib.sha1(self.dump()[320:]).hexdigest()
-            except OverflowError:
-                raise Exception("An error occurred during fakesigning. Ticket could not be fakesigned!")
+        self.signature = _null_signature
+        # Trim off the first 320 bytes, because we're only looking for the hash of the Ticket's body.
+        ticket_body = self.dump()[320:]
+        # We're using the first 2 bytes of the unused unknown2 region of the Ticket as a 16-bit integer, and
+        # incrementing that to brute-force the hash we need. Nothing before that region changes between attempts, so it
+        # only needs to be hashed once, and each attempt can start from a copy of that hash.
+        unknown2_offset = 0x1F2 - 320
+        prefix_hash = hashlib.sha1(ticket_body[:unknown2_offset])
+        body_suffix = ticket_body[unknown2_offset + 2:]
+        for current_int in range(1, 65536):
+            test_hash = prefix_hash.copy()
+            test_hash.update(int.to_bytes(current_int, 2))
+            test_hash.update(body_suffix)
+            if test_hash.digest()[0] == 0:
+                self.unknown2 = int.to_bytes(current_int, 2) + self.unknown2[2:]
+                return
+        # If we've run out of 16-bit integers to try, then fakesigning has failed.
+        raise Exception("An error occurred during fakesigning. Ticket could not be fakesigned!")
 
     def get_is_fakesigned(self) -> bool:
         """
@@ -278,13 +207,26 @@ class Ticket:
         --------
         libWiiPy.title.ticket.Ticket.fakesign()
         """
-        if self.signature != b'\x00' * 256:
+        if self.signature != _null_signature:
             return False
-        test_hash = hashlib.sha1(self.dump()[320:]).hexdigest()
-        if test_hash[:2] != '00':
+        # Hash the body through a memoryview so that it doesn't need to be copied out of the dumped Ticket first.
+        test_hash = hashlib.sha1(memoryview(self.dump())[320:]).digest()
+        if test_hash[0] != 0:
             return False
         return True
 
+    def get_size(self) -> int:
+        """
+        Gets the size of the Ticket when dumped, in bytes, without needing to dump it first.
+
+        Returns
+        -------
+        int
+            The size of the Ticket, in bytes.
+        """
+        # Only v0 Tickets are supported, and those are always the same size.
+        return _ticket_struct.size
+
     def get_title_id(self) -> str:
         """
         Gets the Title ID of the ticket's associated title.
@@ -294,8 +236,11 @@ class Ticket:
         str
             The Title ID of the title.
         """
-        title_id_str = str(self.title_id.decode())
-        return title_id_str
+        # Only decode the Title ID again if it has been replaced since it was last decoded.
+        if self._title_id_str_tag is not self.title_id:
+            self._title_id_str = self.title_id.decode()
+            self._title_id_str_tag = self.title_id
+        return self._title_id_str
 
     def get_common_key_type(self) -> str:
         """
@@ -327,8 +272,13 @@ class Ticket:
         bytes
             The decrypted title key.
         """
-        title_key = decrypt_title_key(self.title_key_enc, self.common_key_index, self.title_id, self.is_dev)
-        return title_key
+        # The Title Key only needs to be decrypted again if the encrypted key, common key index, Title ID, or dev status
+        # has changed since it was last decrypted. Otherwise, the cached key can be returned as-is.
+        cache_tag = (self.title_key_enc, self.common_key_index, self.title_id, self.is_dev)
+        if cache_tag != self._title_key_cache_tag:
+            self._title_key_cache = decrypt_title_key(*cache_tag)
+            self._title_key_cache_tag = cache_tag
+        return self._title_key_cache
 
     def set_title_id(self, title_id) -> None:
         """
@@ -340,8 +290,7 @@ class Ticket:
         title_id : str
             The new Title ID of the title.
         """
-        if len(title_id) != 16:
-            raise ValueError("Invalid Title ID! Title IDs must be 8 bytes long.")
+        _validate_title_id(title_id)
         self.title_id = title_id.encode()
 
     def set_title_version(self, new_version: str | int) -> None:
@@ -364,7 +313,7 @@ class Ticket:
                 raise ValueError("Title version is not valid! String version must be entered in format \"X.X\".")
             if int(version_str_split[0]) > 255 or int(version_str_split[1]) > 255:
                 raise ValueError("Title version is not valid! String version number cannot exceed v255.255.")
-            version_converted = title_ver_standard_to_dec(new_version, str(self.title_id.decode()))
+            version_converted = title_ver_standard_to_dec(new_version, self.get_title_id())
             self.title_version = version_converted
         elif type(new_version) is int:
             # Validate that the version isn't higher than v65280. If the check passes, set that as the title version.
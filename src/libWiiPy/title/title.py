@@ -3,7 +3,7 @@
 #
 # See https://wiibrew.org/wiki/Title for details about how titles are formatted
 
-import math
+from typing import List
 from .cert import (CertificateChain as _CertificateChain,
                    verify_ca_cert as _verify_ca_cert, verify_cert_sig as _verify_cert_sig,
                    verify_tmd_sig as _verify_tmd_sig, verify_ticket_sig as _verify_ticket_sig)
@@ -11,7 +11,7 @@ from .content import ContentRegion as _ContentRegion
 from .ticket import Ticket as _Ticket
 from .tmd import TMD as _TMD
 from .wad import WAD as _WAD
-from .crypto import encrypt_title_key
+from .crypto import rewrap_title_key
 
 
 class Title:
@@ -33,12 +33,25 @@ class Title:
     content: ContentRegion
         A ContentRegion object containing the title's contents.
     """
+    __slots__ = ("wad", "cert_chain", "tmd", "ticket", "content")
+    # The type of each component of a title, used to create empty components on first access.
+    _component_types = {"wad": _WAD, "cert_chain": _CertificateChain, "tmd": _TMD, "ticket": _Ticket,
+                        "content": _ContentRegion}
+
     def __init__(self):
-        self.wad: _WAD = _WAD()
-        self.cert_chain: _CertificateChain = _CertificateChain()
-        self.tmd: _TMD = _TMD()
-        self.ticket: _Ticket = _Ticket()
-        self.content: _ContentRegion = _ContentRegion()
+        # The WAD, CertificateChain, TMD, Ticket, and ContentRegion objects aren't created here, because they'll often
+        # be replaced right away by load_wad(). Instead, an empty one is created by __getattr__() the first time that
+        # one of them is accessed without having been set.
+        pass
+
+    def __getattr__(self, name: str):
+        # This is only called when a slot hasn't been set yet, so create the empty component and store it for next time.
+        try:
+            component = self._component_types[name]()
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        setattr(self, name, component)
+        return component
 
     def load_wad(self, wad: bytes) -> None:
         """
@@ -67,7 +80,7 @@ class Title:
         self.content.load(self.wad.get_content_data(), self.tmd.content_records)
         # Ensure that the Title IDs of the TMD and Ticket match before doing anything else. If they don't, throw an
         # error because clearly something strange has gone on with the WAD and editing it probably won't work.
-        #if self.tmd.title_id != str(self.ticket.title_id.decode()):
+        #if self.tmd.title_id != self.ticket.get_title_id():
         #    raise ValueError("The Title IDs of the TMD and Ticket in this WAD do not match. This WAD appears to be "
         #                     "invalid.")
 
@@ -140,7 +153,7 @@ class Title:
         This requires that a TMD has already been loaded and will throw an exception if it isn't.
         """
         if not self.tmd.content_records:
-            ValueError("No TMD appears to have been loaded, so content records cannot be read from it.")
+            raise ValueError("No TMD appears to have been loaded, so content records cannot be read from it.")
         # Load the content records into the ContentRegion object, and update the number of contents.
         self.content.content_records = self.tmd.content_records
         self.content.num_contents = self.tmd.num_contents
@@ -157,11 +170,17 @@ class Title:
         """
         if len(title_id) != 16:
             raise ValueError("Invalid Title ID! Title IDs must be 8 bytes long.")
+        # If both the TMD and Ticket already have this Title ID, then there's nothing to change, and the Title Key
+        # doesn't need to be re-encrypted.
+        if title_id == self.tmd.title_id and title_id == self.ticket.get_title_id():
+            return
         self.tmd.set_title_id(title_id)
-        title_key_decrypted = self.ticket.get_title_key()
+        old_title_id = self.ticket.title_id
         self.ticket.set_title_id(title_id)
-        title_key_encrypted = encrypt_title_key(title_key_decrypted, self.ticket.common_key_index, title_id,
-                                                self.ticket.is_dev)
+        # Only the Title Key's encrypted form changes here, because the Title ID is the IV used to encrypt it. The
+        # decrypted Title Key stays the same, so the contents don't need to be re-encrypted.
+        title_key_encrypted = rewrap_title_key(self.ticket.title_key_enc, self.ticket.common_key_index, old_title_id,
+                                               title_id, self.ticket.is_dev)
         self.ticket.title_key_enc = title_key_encrypted
 
     def set_title_version(self, title_version: str | int) -> None:
@@ -176,9 +195,11 @@ class Title:
             The new version of the title. See description for valid formats.
         """
         self.tmd.set_title_version(title_version)
-        self.ticket.set_title_version(title_version)
+        # The TMD has already validated and converted the version, so pass the Ticket the decimal form it ended up with
+        # rather than parsing it a second time.
+        self.ticket.set_title_version(self.tmd.title_version)
 
-    def get_content_by_index(self, index: id, skip_hash=False) -> bytes:
+    def get_content_by_index(self, index: id, skip_hash=False, title_key: bytes = None) -> bytes:
         """
         Gets an individual content from the content region based on the provided index, in decrypted form.
 
@@ -188,16 +209,20 @@ class Title:
             The index of the content you want to get.
         skip_hash : bool, optional
             Skip the hash check and return the content regardless of its hash. Defaults to false.
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
 
         Returns
         -------
         bytes
             The decrypted content listed in the content record.
         """
-        dec_content = self.content.get_content_by_index(index, self.ticket.get_title_key(), skip_hash)
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
+        dec_content = self.content.get_content_by_index(index, title_key, skip_hash)
         return dec_content
 
-    def get_content_by_cid(self, cid: int, skip_hash=False) -> bytes:
+    def get_content_by_cid(self, cid: int, skip_hash=False, title_key: bytes = None) -> bytes:
         """
         Gets an individual content from the content region based on the provided Content ID, in decrypted form.
 
@@ -207,15 +232,41 @@ class Title:
             The Content ID of the content you want to get. Expected to be in decimal form.
         skip_hash : bool, optional
             Skip the hash check and return the content regardless of its hash. Defaults to false.
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
 
         Returns
         -------
         bytes
             The decrypted content listed in the content record.
         """
-        dec_content = self.content.get_content_by_cid(cid, self.ticket.get_title_key(), skip_hash)
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
+        dec_content = self.content.get_content_by_cid(cid, title_key, skip_hash)
         return dec_content
 
+    def get_contents(self, skip_hash=False, title_key: bytes = None) -> List[bytes]:
+        """
+        Gets a list of all contents from the content region, in decrypted form. Contents are decrypted and verified in
+        parallel.
+
+        Parameters
+        ----------
+        skip_hash : bool, optional
+            Skip the hash check and return the contents regardless of their hashes. Defaults to false.
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
+
+        Returns
+        -------
+        List[bytes]
+            A list containing all decrypted contents.
+        """
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
+        dec_contents = self.content.get_contents(title_key, skip_hash)
+        return dec_contents
+
     def get_title_size(self, absolute=False) -> int:
         """
         Gets the installed size of the title, including the TMD and Ticket, in bytes. The "absolute" option determines
@@ -232,18 +283,14 @@ class Title:
             The installed size of the title, in bytes.
         """
         title_size = 0
-        # Dumping and measuring the TMD and Ticket this way to ensure that any changes to them are measured properly.
-        # Yes, the Ticket size should be a constant, but it's still good to check just in case.
-        title_size += len(self.tmd.dump())
-        title_size += len(self.ticket.dump())
+        # The TMD and Ticket know their own dumped sizes, so there's no need to actually dump them to measure them.
+        title_size += self.tmd.get_size()
+        title_size += self.ticket.get_size()
         # For contents, get their sizes from the content records, because they store the intended sizes of the decrypted
-        # contents, which are usually different from the encrypted sizes.
-        for record in self.content.content_records:
-            if record.content_type == 32769:
-                if absolute:
-                    title_size += record.content_size
-            else:
-                title_size += record.content_size
+        # contents, which are usually different from the encrypted sizes. Shared contents are only counted if the
+        # absolute size was requested.
+        title_size += sum(record.content_size for record in self.content.content_records
+                          if absolute or record.content_type != 32769)
         return title_size
 
     def get_title_size_blocks(self, absolute=False) -> int:
@@ -265,7 +312,8 @@ class Title:
             The installed size of the title, in blocks.
         """
         title_size_bytes = self.get_title_size(absolute)
-        blocks = math.ceil(title_size_bytes / 131072)
+        # Round up to the next full block using integer math, since 1 block is 2^17 bytes.
+        blocks = (title_size_bytes + 131071) >> 17
         return blocks
 
     def add_enc_content(self, enc_content: bytes, cid: int, index: int, content_type: int, content_size: int,
@@ -287,14 +335,14 @@ class Title:
         content_size : int
             The size of the new encrypted content when decrypted.
         content_hash : bytes
-            The hash of the new encrypted content when decrypted.
+            The raw SHA-1 hash of the new encrypted content when decrypted.
         """
         # Add the encrypted content.
         self.content.add_enc_content(enc_content, cid, index, content_type, content_size, content_hash)
         # Update the TMD to match.
         self.tmd.content_records = self.content.content_records
 
-    def add_content(self, dec_content: bytes, cid: int, content_type: int) -> None:
+    def add_content(self, dec_content: bytes, cid: int, content_type: int, title_key: bytes = None) -> None:
         """
         Adds a new decrypted content to the end of the ContentRegion, and adds the provided Content ID, content type,
         content size, and content hash to a new record in the ContentRecord list. The index will be automatically
@@ -311,9 +359,36 @@ class Title:
             The Content ID to assign the new content in the content record.
         content_type : int
             The type of the new content.
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
         """
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
         # Add the decrypted content.
-        self.content.add_content(dec_content, cid, content_type, self.ticket.get_title_key())
+        self.content.add_content(dec_content, cid, content_type, title_key)
+        # Update the TMD to match.
+        self.tmd.content_records = self.content.content_records
+
+    def add_contents(self, dec_contents: List[tuple[bytes, int, int]], title_key: bytes = None) -> None:
+        """
+        Adds multiple new decrypted contents to the end of the ContentRegion at once, and adds a new record to the
+        ContentRecord list for each of them. Each content is provided as a tuple of its data, Content ID, and content
+        type. Indices will be automatically assigned in order by incrementing the current highest index in the records.
+
+        The contents are hashed and encrypted with the Title Key in parallel, which is much faster than adding each
+        content one at a time with add_content().
+
+        Parameters
+        ----------
+        dec_contents : List[tuple[bytes, int, int]]
+            The new decrypted contents to add, as tuples of (data, Content ID, content type).
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
+        """
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
+        # Add the decrypted contents.
+        self.content.add_contents(dec_contents, title_key)
         # Update the TMD to match.
         self.tmd.content_records = self.content.content_records
 
@@ -335,7 +410,7 @@ class Title:
         content_size : int
             The size of the new encrypted content when decrypted.
         content_hash : bytes
-            The hash of the new encrypted content when decrypted.
+            The raw SHA-1 hash of the new encrypted content when decrypted.
         cid : int
             The Content ID to assign the new content in the content record.
         content_type : int
@@ -346,7 +421,8 @@ class Title:
         # Update the TMD to match.
         self.tmd.content_records = self.content.content_records
 
-    def set_content(self, dec_content: bytes, index: int, cid: int = None, content_type: int = None) -> None:
+    def set_content(self, dec_content: bytes, index: int, cid: int = None, content_type: int = None,
+                    title_key: bytes = None) -> None:
         """
         Sets the content at the provided index to the provided new decrypted content. The hash and content size of this
         content will be generated and then set in the corresponding content record. A new Content ID or content type can
@@ -364,13 +440,17 @@ class Title:
             The Content ID to assign the new content in the content record.
         content_type : int, optional
             The type of the new content.
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
         """
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
         # Set the decrypted content.
-        self.content.set_content(dec_content, index, self.ticket.get_title_key(), cid, content_type)
+        self.content.set_content(dec_content, index, title_key, cid, content_type)
         # Update the TMD to match.
         self.tmd.content_records = self.content.content_records
 
-    def load_content(self, dec_content: bytes, index: int) -> None:
+    def load_content(self, dec_content: bytes, index: int, title_key: bytes = None) -> None:
         """
         Loads the provided decrypted content into the ContentRegion at the specified index, but first checks to make
         sure that it matches the corresponding record. This content will then be encrypted using the title's Title Key
@@ -382,9 +462,13 @@ class Title:
             The decrypted content to load.
         index : int
             The index to load the content at.
+        title_key : bytes, optional
+            The decrypted Title Key to use. Defaults to the Title Key from the Ticket if not set.
         """
+        if title_key is None:
+            title_key = self.ticket.get_title_key()
         # Load the decrypted content.
-        self.content.load_content(dec_content, index, self.ticket.get_title_key())
+        self.content.load_content(dec_content, index, title_key)
 
     def fakesign(self) -> None:
         """
@@ -402,7 +486,7 @@ class Title:
         self.tmd.fakesign()
         self.ticket.fakesign()
 
-    def get_is_fakesigned(self):
+    def get_is_fakesigned(self) -> bool:
         """
         Checks the Title object to see if it is currently fakesigned. This ensures that both the TMD and Ticket are
         fakesigned. For a description of fakesigning, refer to the fakesign() method.
@@ -416,10 +500,8 @@ class Title:
         --------
         libWiiPy.title.title.Title.fakesign()
         """
-        if self.tmd.get_is_fakesigned and self.ticket.get_is_fakesigned():
-            return True
-        else:
-            return False
+        # Check the Ticket first, since it's fixed-size and cheaper to dump and hash than the TMD is for most titles.
+        return self.ticket.get_is_fakesigned() and self.tmd.get_is_fakesigned()
 
     def get_is_signed(self) -> bool:
         """
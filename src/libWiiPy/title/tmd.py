@@ -3,16 +3,34 @@
 #
 # See https://wiibrew.org/wiki/Title_metadata for details about the TMD format
 
-import io
-import binascii
 import hashlib
-import math
 import struct
 from typing import List
 from enum import IntEnum as _IntEnum
 from ..types import _ContentRecord
 from ..shared import _bitmask
-from .util import title_ver_dec_to_standard, title_ver_standard_to_dec
+from .util import title_ver_dec_to_standard, title_ver_standard_to_dec, _validate_title_id
+
+# The layout of a TMD's header, which is always 0x1E4 bytes long and is followed by the content records. Fields are, in
+# order: signature type, signature, signing certificate issuer, TMD version, Certificate Authority CRL version,
+# Certificate Policy CRL version, vWii flag, IOS Title ID, Title ID, title type, group ID, region, parental controls
+# ratings, "reserved" data 1, IPC mask, "reserved" data 2, access rights, title version, number of contents, boot
+# index, and minor version.
+#
+# The title type is an internal property used to show if a title is for the ill-fated NetCard (0), or the Wii (1), and
+# is therefore always 1 for Wii TMDs. The region is 0 = JAP, 1 = USA, 2 = EUR, 3 = WORLD, 4 = KOR. The access rights
+# control DVD-video and AHB access.
+_tmd_header = struct.Struct(">4s256s60x64sBBBB8s8s4sH2xH16s12s12s18sIHHHH")
+# The layout of a single 36 byte content record. Fields are, in order: Content ID, index, content type, content size,
+# and the SHA-1 hash of the decrypted content.
+_content_record = struct.Struct(">LHHQ20s")
+# Names for the values of the region field.
+_title_regions = {0: "JPN", 1: "USA", 2: "EUR", 3: "None", 4: "KOR"}
+# Names for the types of titles, based on the first half of their Title ID.
+_title_types = {"00000001": "System", "00010000": "Game", "00010001": "Channel", "00010002": "SystemChannel",
+                "00010004": "GameChannel", "00010005": "DLC", "00010008": "HiddenChannel"}
+# Names for the types of contents, based on the content type listed in their content record.
+_content_types = {1: "Normal", 2: "Development/Unknown", 3: "Hash Tree", 16385: "DLC", 32769: "Shared"}
 
 
 class TMD:
@@ -55,12 +73,19 @@ class TMD:
         self.reserved2: bytes = b''  # Other "Reserved" data from WiiBrew.
         self.access_rights: int = 0
         self.title_version: int = 0  # The version of the associated title.
-        self.title_version_converted: int = 0  # The title version in vX.X format.
         self.num_contents: int = 0  # The number of contents contained in the associated title.
         self.boot_index: int = 0  # The content index that contains the bootable executable.
         self.minor_version: int = 0  # Minor version (unused typically).
         self.content_records: List[_ContentRecord] = []
 
+    @property
+    def title_version_converted(self) -> str:
+        """
+        The version of the title in standard form (vX.X). This is converted from the title version when accessed, so it
+        always matches the current title version and Title ID.
+        """
+        return title_ver_dec_to_standard(self.title_version, self.title_id, bool(self.vwii))
+
     def load(self, tmd: bytes) -> None:
         """
         Loads raw TMD data and sets all attributes of the TMD object. This allows for manipulating an already
@@ -71,92 +96,23 @@ class TMD:
         tmd : bytes
             The data for the TMD you wish to load.
         """
-        with io.BytesIO(tmd) as tmd_data:
-            # ====================================================================================
-            # Parses each of the keys contained in the TMD.
-            # ====================================================================================
-            # Signature type.
-            tmd_data.seek(0x0)
-            self.signature_type = tmd_data.read(4)
-            # Signature data.
-            tmd_data.seek(0x04)
-            self.signature = tmd_data.read(256)
-            # Signing certificate issuer.
-            tmd_data.seek(0x140)
-            self.signature_issuer = str(tmd_data.read(64).replace(b'\x00', b'').decode())
-            # TMD version, seems to usually be 0, but I've seen references to other numbers.
-            tmd_data.seek(0x180)
-            self.tmd_version = int.from_bytes(tmd_data.read(1))
-            # Certificate Authority CRL version.
-            tmd_data.seek(0x181)
-            self.ca_crl_version = int.from_bytes(tmd_data.read(1))
-            # Certificate Policy CRL version.
-            tmd_data.seek(0x182)
-            self.signer_crl_version = int.from_bytes(tmd_data.read(1))
-            # If this is a vWii title or not.
-            tmd_data.seek(0x183)
-            self.vwii = int.from_bytes(tmd_data.read(1))
-            # TID of the IOS to use for the title, set to 0 if this title is the IOS, set to boot2 version if boot2.
-            tmd_data.seek(0x184)
-            ios_version_bin = tmd_data.read(8)
-            ios_version_hex = binascii.hexlify(ios_version_bin)
-            self.ios_tid = str(ios_version_hex.decode())
-            # Get IOS version based on TID.
-            self.ios_version = int(self.ios_tid[-2:], 16)
-            # Title ID of the title.
-            tmd_data.seek(0x18C)
-            title_id_bin = tmd_data.read(8)
-            title_id_hex = binascii.hexlify(title_id_bin)
-            self.title_id = str(title_id_hex.decode())
-            # Type of the title. This is an internal property used to show if this title is for the ill-fated
-            # NetCard (0), or the Wii (1), and is therefore always 1 for Wii TMDs.
-            tmd_data.seek(0x194)
-            self.title_type = tmd_data.read(4)
-            # Publisher of the title.
-            tmd_data.seek(0x198)
-            self.group_id = int.from_bytes(tmd_data.read(2))
-            # Region of the title, 0 = JAP, 1 = USA, 2 = EUR, 3 = WORLD, 4 = KOR.
-            tmd_data.seek(0x19C)
-            region_hex = tmd_data.read(2)
-            self.region = int.from_bytes(region_hex)
-            # Content rating of the title for parental controls. Likely based on ESRB, CERO, PEGI, etc. rating.
-            tmd_data.seek(0x19E)
-            self.ratings = tmd_data.read(16)
-            # "Reserved" data 1.
-            tmd_data.seek(0x1AE)
-            self.reserved1 = tmd_data.read(12)
-            # IPC mask.
-            tmd_data.seek(0x1BA)
-            self.ipc_mask = tmd_data.read(12)
-            # "Reserved" data 2.
-            tmd_data.seek(0x1C6)
-            self.reserved2 = tmd_data.read(18)
-            # Access rights of the title; DVD-video and AHB access.
-            tmd_data.seek(0x1D8)
-            self.access_rights = int.from_bytes(tmd_data.read(4))
-            # Version number straight from the TMD.
-            tmd_data.seek(0x1DC)
-            self.title_version = int.from_bytes(tmd_data.read(2))
-            # Calculate the converted version number via util module.
-            self.title_version_converted = title_ver_dec_to_standard(self.title_version, self.title_id, bool(self.vwii))
-            # The number of contents listed in the TMD.
-            tmd_data.seek(0x1DE)
-            self.num_contents = int.from_bytes(tmd_data.read(2))
-            # The content index that contains the bootable executable.
-            tmd_data.seek(0x1E0)
-            self.boot_index = int.from_bytes(tmd_data.read(2))
-            # The minor version of the title (typically unused).
-            tmd_data.seek(0x1E2)
-            self.minor_version = int.from_bytes(tmd_data.read(2))
-            # Get content records for the number of contents in num_contents.
-            self.content_records = []
-            for content in range(0, self.num_contents):
-                tmd_data.seek(0x1E4 + (36 * content))
-                content_record_hdr = struct.unpack(">LHH4x4s20s", tmd_data.read(36))
-                self.content_records.append(
-                    _ContentRecord(int(content_record_hdr[0]), int(content_record_hdr[1]),
-                                   int(content_record_hdr[2]), int.from_bytes(content_record_hdr[3]),
-                                   binascii.hexlify(content_record_hdr[4])))
+        # Parse every field of the TMD's header at once, since they're all at fixed offsets.
+        (self.signature_type, self.signature, signature_issuer, self.tmd_version, self.ca_crl_version,
+         self.signer_crl_version, self.vwii, ios_tid, title_id, self.title_type, self.group_id, self.region,
+         self.ratings, self.reserved1, self.ipc_mask, self.reserved2, self.access_rights, self.title_version,
+         self.num_contents, self.boot_index, self.minor_version) = _tmd_header.unpack_from(tmd)
+        self.signature_issuer = str(signature_issuer.replace(b'\x00', b'').decode())
+        # TID of the IOS to use for the title, set to 0 if this title is the IOS, set to boot2 version if boot2.
+        self.ios_tid = ios_tid.hex()
+        # Get IOS version based on TID.
+        self.ios_version = int(self.ios_tid[-2:], 16)
+        self.title_id = title_id.hex()
+        # Get content records for the number of contents in num_contents. Each record is 36 bytes long, and contains the
+        # Content ID, index, content type, content size, and SHA-1 hash of a content. The records are read through a
+        # memoryview so that they aren't copied out of the TMD first.
+        content_records = memoryview(tmd)[0x1E4:0x1E4 + (36 * self.num_contents)]
+        self.content_records = [_ContentRecord(*content_record) for content_record
+                                in _content_record.iter_unpack(content_records)]
 
     def dump(self) -> bytes:
         """
@@ -167,68 +123,22 @@ class TMD:
         bytes
             The full TMD file as bytes.
         """
-        tmd_data = b''
-        # Signature type.
-        tmd_data += self.signature_type
-        # Signature data.
-        tmd_data += self.signature
-        # Padding to 64 bytes.
-        tmd_data += b'\x00' * 60
-        # Signing certificate issuer.
-        signature_issuer = self.signature_issuer.encode()
-        while len(signature_issuer) < 0x40:
-            signature_issuer += b'\x00'
-        tmd_data += signature_issuer
-        # TMD version.
-        tmd_data += int.to_bytes(self.tmd_version, 1)
-        # Certificate Authority CRL version.
-        tmd_data += int.to_bytes(self.ca_crl_version, 1)
-        # Certificate Policy CRL version.
-        tmd_data += int.to_bytes(self.signer_crl_version, 1)
-        # If this is a vWii title or not.
-        tmd_data += int.to_bytes(self.vwii, 1)
-        # IOS Title ID.
-        tmd_data += binascii.unhexlify(self.ios_tid)
-        # Title's Title ID.
-        tmd_data += binascii.unhexlify(self.title_id)
-        # Title type.
-        tmd_data += self.title_type
-        # Group ID.
-        tmd_data += int.to_bytes(self.group_id, 2)
-        # 2 bytes of zero for reasons.
-        tmd_data += b'\x00\x00'
-        # Region.
-        tmd_data += int.to_bytes(self.region, 2)
-        # Parental Controls Ratings.
-        tmd_data += self.ratings
-        # "Reserved" 1.
-        tmd_data += self.reserved1
-        # IPC mask.
-        tmd_data += self.ipc_mask
-        # "Reserved" 2.
-        tmd_data += self.reserved2
-        # Access rights.
-        tmd_data += int.to_bytes(self.access_rights, 4)
-        # Title version.
-        tmd_data += int.to_bytes(self.title_version, 2)
-        # Number of contents.
-        tmd_data += int.to_bytes(self.num_contents, 2)
-        # Boot index.
-        tmd_data += int.to_bytes(self.boot_index, 2)
-        # Minor version.
-        tmd_data += int.to_bytes(self.minor_version, 2)
-        # Iterate over content records, write them back into raw data, then add them to the TMD.
+        # The size of the TMD is known ahead of time, so write everything into a buffer of that size rather than
+        # building the TMD up piece by piece.
+        tmd_data = bytearray(self.get_size())
+        # Write the TMD's header using the same Struct that load() reads it with.
+        _tmd_header.pack_into(tmd_data, 0, self.signature_type, self.signature, self.signature_issuer.encode(),
+                              self.tmd_version, self.ca_crl_version, self.signer_crl_version, self.vwii,
+                              bytes.fromhex(self.ios_tid), bytes.fromhex(self.title_id), self.title_type, self.group_id,
+                              self.region, self.ratings, self.reserved1, self.ipc_mask, self.reserved2,
+                              self.access_rights, self.title_version, self.num_contents, self.boot_index,
+                              self.minor_version)
+        # Iterate over content records and write them back into raw data after the header.
         for content_record in range(self.num_contents):
-            content_data = b''
-            # Write all fields from the content record.
-            content_data += int.to_bytes(self.content_records[content_record].content_id, 4)
-            content_data += int.to_bytes(self.content_records[content_record].index, 2)
-            content_data += int.to_bytes(self.content_records[content_record].content_type, 2)
-            content_data += int.to_bytes(self.content_records[content_record].content_size, 8)
-            content_data += binascii.unhexlify(self.content_records[content_record].content_hash)
-            # Write the record to the TMD.
-            tmd_data += content_data
-        return tmd_data
+            record = self.content_records[content_record]
+            _content_record.pack_into(tmd_data, 0x1E4 + (36 * content_record), record.content_id, record.index,
+                                      record.content_type, record.content_size, record.content_hash)
+        return bytes(tmd_data)
 
     def fakesign(self) -> None:
         """
@@ -247,18 +157,24 @@ class TMD:
         # Clear the signature, so that the hash derived from it is guaranteed to always be
         # '0000000000000000000000000000000000000000'.
         self.signature = b'\x00' * 256
-        current_int = 0
-        test_hash = ''
-        while test_hash[:2] != '00':
-            current_int += 1
-            self.minor_version = current_int
-            # Trim off the first 320 bytes, because we're only looking for the hash of the TMD's body.
-            # This is a try-except because an OverflowError will be thrown if the number being used to brute-force the
-            # hash gets too big, as it is only a 16-bit integer. If that happens, then fakesigning has failed.
-            try:
-                test_hash = hashlib.sha1(self.dump()[320:]).hexdigest()
-            except OverflowError:
-                raise Exception("An error occurred during fakesigning. TMD could not be fakesigned!")
+        # Trim off the first 320 bytes, because we're only looking for the hash of the TMD's body. This is done through
+        # a memoryview so that neither the body nor the parts of it hashed below need to be copied out of the dump.
+        tmd_body = memoryview(self.dump())[320:]
+        # The minor version is an unused 16-bit integer, so it's incremented to brute-force the hash we need. Nothing
+        # before it changes between attempts, so that part only needs to be hashed once, and each attempt can start
+        # from a copy of that hash.
+        minor_version_offset = 0x1E2 - 320
+        prefix_hash = hashlib.sha1(tmd_body[:minor_version_offset])
+        body_suffix = tmd_body[minor_version_offset + 2:]
+        for current_int in range(1, 65536):
+            test_hash = prefix_hash.copy()
+            test_hash.update(int.to_bytes(current_int, 2))
+            test_hash.update(body_suffix)
+            if test_hash.digest()[0] == 0:
+                self.minor_version = current_int
+                return
+        # If we've run out of 16-bit integers to try, then fakesigning has failed.
+        raise Exception("An error occurred during fakesigning. TMD could not be fakesigned!")
 
     def get_is_fakesigned(self) -> bool:
         """
@@ -276,8 +192,10 @@ class TMD:
         """
         if self.signature != b'\x00' * 256:
             return False
-        test_hash = hashlib.sha1(self.dump()[320:]).hexdigest()
-        if test_hash[:2] != '00':
+        # Only the first byte of the hash needs to be checked, so there's no need to convert the whole thing to hex. The
+        # body is hashed through a memoryview so that it doesn't need to be copied out of the dumped TMD first.
+        test_hash = hashlib.sha1(memoryview(self.dump())[320:]).digest()
+        if test_hash[0] != 0:
             return False
         return True
 
@@ -294,17 +212,7 @@ class TMD:
         str
             The region of the title.
         """
-        match self.region:
-            case 0:
-                return "JPN"
-            case 1:
-                return "USA"
-            case 2:
-                return "EUR"
-            case 3:
-                return "None"
-            case 4:
-                return "KOR"
+        return _title_regions.get(self.region)
 
     def get_title_type(self) -> str:
         """
@@ -318,23 +226,7 @@ class TMD:
         str
             The type of the title.
         """
-        match self.title_id[:8]:
-            case '00000001':
-                return "System"
-            case '00010000':
-                return "Game"
-            case '00010001':
-                return "Channel"
-            case '00010002':
-                return "SystemChannel"
-            case '00010004':
-                return "GameChannel"
-            case '00010005':
-                return "DLC"
-            case '00010008':
-                return "HiddenChannel"
-            case _:
-                return "Unknown"
+        return _title_types.get(self.title_id[:8], "Unknown")
 
     def get_content_type(self, content_index: int) -> str:
         """
@@ -353,26 +245,12 @@ class TMD:
         str
             The type of content.
         """
-        # Get a list of the current content indices, so we can make sure the target one exists. Doing it this way
-        # ensures we can find the target, even if the highest content index is greater than the highest literal index.
-        current_indices = []
+        # Find the record with the target content index. Searching by the index stored in each record ensures we can
+        # find the target, even if the highest content index is greater than the highest literal index.
         for record in self.content_records:
-            current_indices.append(record.index)
-        # This is the literal index in the list of content that we're going to get.
-        target_index = current_indices.index(content_index)
-        match self.content_records[target_index].content_type:
-            case 1:
-                return "Normal"
-            case 2:
-                return "Development/Unknown"
-            case 3:
-                return "Hash Tree"
-            case 16385:
-                return "DLC"
-            case 32769:
-                return "Shared"
-            case _:
-                return "Unknown"
+            if record.index == content_index:
+                return _content_types.get(record.content_type, "Unknown")
+        raise ValueError(f"No content with an index of {content_index} exists!")
 
     def get_content_record(self, record) -> _ContentRecord:
         """
@@ -448,9 +326,22 @@ class TMD:
             The installed size of the content, in blocks.
         """
         title_size_bytes = self.get_content_size(absolute, dlc)
-        blocks = math.ceil(title_size_bytes / 131072)
+        # Round up to the next full block using integer math, since 1 block is 2^17 bytes.
+        blocks = (title_size_bytes + 131071) >> 17
         return blocks
 
+    def get_size(self) -> int:
+        """
+        Gets the size of the TMD when dumped, in bytes, without needing to dump it first.
+
+        Returns
+        -------
+        int
+            The size of the TMD, in bytes.
+        """
+        # The TMD is a fixed 0x1E4 byte header followed by one 36 byte record for each content.
+        return 0x1E4 + (36 * self.num_contents)
+
     class AccessFlags(_IntEnum):
         AHB = 0
         DVD_VIDEO = 1
@@ -486,8 +377,7 @@ class TMD:
         title_id : str
             The new Title ID of the title.
         """
-        if len(title_id) != 16:
-            raise ValueError("Invalid Title ID! Title IDs must be 8 bytes long.")
+        _validate_title_id(title_id)
         self.title_id = title_id
 
     def set_title_version(self, new_version: str | int) -> None:
@@ -504,22 +394,18 @@ class TMD:
         """
         if type(new_version) is str:
             # Validate string input is in the correct format, then validate that the version isn't higher than v255.0.
-            # If checks pass, set that as the converted version, then convert to decimal form and set that as well.
+            # If checks pass, convert to decimal form and set that as the title version.
             version_str_split = new_version.split(".")
             if len(version_str_split) != 2:
                 raise ValueError("Title version is not valid! String version must be entered in format \"X.X\".")
             if int(version_str_split[0]) > 255 or int(version_str_split[1]) > 255:
                 raise ValueError("Title version is not valid! String version number cannot exceed v255.255.")
-            self.title_version_converted = new_version
             version_converted = title_ver_standard_to_dec(new_version, self.title_id)
             self.title_version = version_converted
         elif type(new_version) is int:
-            # Validate that the version isn't higher than v65280. If the check passes, set that as the title version,
-            # then convert to standard form and set that as well.
+            # Validate that the version isn't higher than v65280. If the check passes, set that as the title version.
             if new_version > 65535:
                 raise ValueError("Title version is not valid! Integer version number cannot exceed v65535.")
             self.title_version = new_version
-            version_converted = title_ver_dec_to_standard(new_version, self.title_id, bool(self.vwii))
-            self.title_version_converted = version_converted
         else:
             raise TypeError("Title version type is not valid! Type must be either integer or string.")
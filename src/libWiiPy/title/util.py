@@ -3,10 +3,23 @@
 #
 # General title-related utilities that don't fit within a specific module.
 
-import math
 from ..shared import _wii_menu_versions, _vwii_menu_versions
 
 
+def _invert_menu_versions(menu_versions: dict) -> dict:
+    # Maps decimal versions back to their System Menu version names. Some names (like "Prelaunch") cover more than one
+    # decimal version, so each of those versions gets its own entry.
+    inverted = {}
+    for name, versions in menu_versions.items():
+        for version in (versions if isinstance(versions, list) else [versions]):
+            inverted[version] = name
+    return inverted
+
+
+_wii_menu_versions_inv = _invert_menu_versions(_wii_menu_versions)
+_vwii_menu_versions_inv = _invert_menu_versions(_vwii_menu_versions)
+
+
 def title_ver_dec_to_standard(version: int, title_id: str, vwii: bool = False) -> str:
     """
     Converts a title's version from decimal form (vXXX, the way the version is stored in the TMD/Ticket) to its standard
@@ -30,20 +43,14 @@ def title_ver_dec_to_standard(version: int, title_id: str, vwii: bool = False) -
     version_out = ""
     if title_id == "0000000100000002":
         if vwii:
-            try:
-                version_out = list(_vwii_menu_versions.keys())[list(_vwii_menu_versions.values()).index(version)]
-            except ValueError:
-                version_out = ""
+            version_out = _vwii_menu_versions_inv.get(version, "")
         else:
-            try:
-                version_out = list(_wii_menu_versions.keys())[list(_wii_menu_versions.values()).index(version)]
-            except ValueError:
-                version_out = ""
+            version_out = _wii_menu_versions_inv.get(version, "")
     else:
-        # For most channels, we need to get the floored value of version / 256 for the major version, and the version %
-        # 256 as the minor version. Minor versions > 9 are intended, as Nintendo themselves frequently used them.
-        version_upper = math.floor(version / 256)
-        version_lower = version % 256
+        # For most channels, the upper byte of the version is the major version and the lower byte is the minor version.
+        # Minor versions > 9 are intended, as Nintendo themselves frequently used them.
+        version_upper = version >> 8
+        version_lower = version & 0xFF
         version_out = f"{version_upper}.{version_lower}"
 
     return version_out
@@ -72,9 +79,28 @@ def title_ver_standard_to_dec(version: str, title_id: str) -> int:
     if title_id == "0000000100000002":
         raise ValueError("The System Menu's version cannot currently be converted.")
     else:
-        version_str_split = version.split(".")
-        version_upper = int(version_str_split[0]) * 256
-        version_lower = int(version_str_split[1])
-        version_out = version_upper + version_lower
+        version_upper, _, version_lower = version.partition(".")
+        version_out = (int(version_upper) << 8) + int(version_lower)
 
     return version_out
+
+
+def _validate_title_id(title_id: str) -> None:
+    """
+    Checks that a Title ID is 16 hexadecimal digits long, and raises a ValueError if it isn't.
+
+    Parameters
+    ----------
+    title_id : str
+        The Title ID to validate.
+    """
+    if len(title_id) != 16:
+        raise ValueError("Invalid Title ID! Title IDs must be 8 bytes long.")
+    # Converting the Title ID to bytes checks that it's entirely hex digits.
+    try:
+        title_id_bin = bytes.fromhex(title_id)
+    except ValueError:
+        raise ValueError("Invalid Title ID! Title IDs must be made up of hexadecimal digits.") from None
+    # Whitespace between digits is skipped rather than rejected by the conversion, so the length is checked again.
+    if len(title_id_bin) != 8:
+        raise ValueError("Invalid Title ID! Title IDs must be made up of hexadecimal digits.")
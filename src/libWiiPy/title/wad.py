@@ -5,7 +5,7 @@
 
 import io
 import binascii
-from ..shared import _align_value, _pad_bytes
+from ..shared import _align_value
 
 
 class WAD:
@@ -161,26 +161,15 @@ class WAD:
         wad_data += int.to_bytes(self.wad_content_size, 4)
         # WAD meta size.
         wad_data += int.to_bytes(self.wad_meta_size, 4)
-        wad_data = _pad_bytes(wad_data)
-        # Retrieve the cert data and write it out.
-        wad_data += self.get_cert_data()
-        wad_data = _pad_bytes(wad_data)
-        # Retrieve the crl data and write it out.
-        wad_data += self.get_crl_data()
-        wad_data = _pad_bytes(wad_data)
-        # Retrieve the ticket data and write it out.
-        wad_data += self.get_ticket_data()
-        wad_data = _pad_bytes(wad_data)
-        # Retrieve the TMD data and write it out.
-        wad_data += self.get_tmd_data()
-        wad_data = _pad_bytes(wad_data)
-        # Retrieve the content data and write it out.
-        wad_data += self.get_content_data()
-        wad_data = _pad_bytes(wad_data)
-        # Retrieve the meta/footer data and write it out.
-        wad_data += self.get_meta_data()
-        wad_data = _pad_bytes(wad_data)
-        return wad_data
+        # Every section of the WAD is padded out to a multiple of 64 bytes. Rather than growing the WAD one section at a
+        # time, collect each section followed by its padding, and then join them all at the end so that the potentially
+        # very large output only needs to be allocated and copied into once.
+        wad_sections = []
+        for section in (wad_data, self.get_cert_data(), self.get_crl_data(), self.get_ticket_data(),
+                        self.get_tmd_data(), self.get_content_data(), self.get_meta_data()):
+            wad_sections.append(section)
+            wad_sections.append(b'\x00' * (_align_value(len(section)) - len(section)))
+        return b''.join(wad_sections)
 
     def get_wad_type(self) -> str:
         """
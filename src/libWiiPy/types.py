@@ -4,7 +4,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class _ContentRecord:
     """
     A content record object that contains the details of a content contained in a title. This information must match
@@ -21,11 +21,18 @@ class _ContentRecord:
         The type of the content.
     content_size : int
         The size of the content when decrypted.
-    content_hash
-        The SHA-1 hash of the decrypted content.
+    content_hash : bytes
+        The raw SHA-1 hash of the decrypted content.
     """
     content_id: int
     index: int
     content_type: int  # Type of content, possible values of: 0x0001: Normal, 0x4001: DLC, 0x8001: Shared.
     content_size: int
     content_hash: bytes
+
+    @property
+    def content_hash_hex(self) -> str:
+        """
+        The SHA-1 hash of the decrypted content as a hex string, for display purposes.
+        """
+        return self.content_hash.hex()
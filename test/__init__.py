@@ -6,6 +6,7 @@
 import unittest
 
 from .title.commonkeys_test import *
+from .title.crypto_test import *
 from .title.nus_test import *
 
 if __name__ == '__main__':
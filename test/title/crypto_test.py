@@ -0,0 +1,32 @@
+# "crypto_test.py" from libWiiPy by NinjaCheetah & Contributors
+# https://github.com/NinjaCheetah/libWiiPy
+
+import unittest
+
+from libWiiPy import title
+
+
+class TestTitleKeyCrypto(unittest.TestCase):
+    title_key = b'\x00\x11\x22\x33\x44\x55\x66\x77\x88\x99\xaa\xbb\xcc\xdd\xee\xff'
+
+    def test_title_key_round_trip(self):
+        for common_key_index in range(3):
+            title_key_enc = title.encrypt_title_key(self.title_key, common_key_index, "0001000148414345")
+            self.assertEqual(title.decrypt_title_key(title_key_enc, common_key_index, "0001000148414345"),
+                             self.title_key)
+
+    def test_rewrap_title_key(self):
+        # Changing the Title ID only changes the IV used to encrypt the Title Key, so the decrypted key (and therefore
+        # the encryption of every content) must stay the same.
+        for common_key_index in range(3):
+            title_key_enc = title.encrypt_title_key(self.title_key, common_key_index, "0001000148414345")
+            title_key_rewrapped = title.rewrap_title_key(title_key_enc, common_key_index, "0001000148414345",
+                                                         "0001000148414346")
+            self.assertEqual(title_key_rewrapped,
+                             title.encrypt_title_key(self.title_key, common_key_index, "0001000148414346"))
+            self.assertEqual(title.decrypt_title_key(title_key_rewrapped, common_key_index, "0001000148414346"),
+                             self.title_key)
+
+
+if __name__ == '__main__':
+    unittest.main()